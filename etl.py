@@ -7,10 +7,20 @@ transforms and enriches the data, and loads it into SQLite database.
 import pandas as pd
 import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import aiohttp
+import asyncio
 import time
 import re
+import json
+import hashlib
 import logging
-from typing import Optional, Dict
+import argparse
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Optional, Dict
 from pathlib import Path
 
 # Configuration
@@ -18,9 +28,18 @@ CONFIG = {
     'API_KEY': '--------',  # Replace with your OMDb API key
     'DATA_PATH': 'data',  # Path to CSV files directory
     'DB_NAME': 'movie_database.db',
+    'OUTPUT': 'sqlite',  # 'sqlite' or 'parquet' (see --output)
+    'PARQUET_DIR': 'parquet',  # Where the parquet extracts are written
+    'CACHE_DB': 'omdb_cache.db',  # Persistent OMDb response cache (None to disable)
+    'OMDB_REPLAY': False,  # Fail on cache miss instead of calling the API
     'MOVIES_CSV': 'movies.csv',
     'RATINGS_CSV': 'ratings.csv',
-    'API_DELAY': 1,  # Seconds between API calls to respect rate limits
+    'RATINGS_CHUNKSIZE': 200_000,  # Rows of ratings.csv held in memory at once
+    'API_RATE_PER_MIN': 60,  # Sustained OMDb request rate
+    'API_BURST': 10,  # Requests allowed back-to-back after idle time
+    'MAX_CONCURRENCY': 20,  # Max in-flight OMDb requests
+    'MOVIE_BATCH_SIZE': 100,  # Enriched movies written per INSERT batch
+    'ENRICH_MODE': 'async',  # 'async' (aiohttp) or 'threads' (requests + thread pool)
     'MAX_MOVIES': 100  # Limit movies to process 
 }
 
@@ -31,6 +50,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+OMDB_URL = 'http://www.omdbapi.com/'
+
+# Column order of the rows written to the movies table
+MOVIE_COLUMNS = ('movieId', 'title', 'year', 'imdbId', 'director',
+                 'plot', 'boxoffice', 'runtime', 'rated')
+
+# Statements shared by the loaders and the OMDb cache
+INSERT_MOVIE_SQL = """
+    INSERT OR REPLACE INTO movies 
+    (movieId, title, year, imdbId, director, plot, boxoffice, runtime, rated)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSERT_GENRE_SQL = "INSERT OR IGNORE INTO genres (genreName) VALUES (?)"
+INSERT_MOVIE_GENRE_SQL = "INSERT OR IGNORE INTO movie_genres (movieId, genreId) VALUES (?, ?)"
+SELECT_CACHE_SQL = "SELECT json FROM omdb_cache WHERE key = ?"
+INSERT_CACHE_SQL = "INSERT OR REPLACE INTO omdb_cache (key, json, fetched_at) VALUES (?, ?, ?)"
+
+# Older SQLite builds cap a statement at 999 bound parameters
+SQLITE_MAX_VARIABLES = 999
+
+# Narrow dtypes for ratings.csv: half the bytes of the int64/float64 defaults
+RATINGS_DTYPES = {
+    'userId': 'int32',
+    'movieId': 'int32',
+    'rating': 'float32',
+    'timestamp': 'int32',
+}
+
+
+# MovieLens titles carry the release year in parentheses, e.g. "Toy Story (1995)"
+_YEAR_RE = re.compile(r'\((\d{4})\)')
+_YEAR_STRIP_RE = re.compile(r'\s*\(\d{4}\)\s*$')
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when an OMDb response is not cached"""
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by all OMDb requests"""
+    
+    def __init__(self, rate_per_min: float, capacity: int):
+        self.rate_per_sec = rate_per_min / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+        self._async_lock = None
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_sec)
+        self.last_update = now
+    
+    def _wait_time(self) -> float:
+        """Refill, then return how long to wait for a whole token"""
+        self._refill()
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.rate_per_sec
+        return 0.0
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        with self._lock:
+            wait = self._wait_time()
+            if wait:
+                time.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            wait = self._wait_time()
+            if wait:
+                await asyncio.sleep(wait)
+                self._refill()
+            self.tokens -= 1
+    
+    def update_from_headers(self, headers):
+        """Drain tokens the server says we no longer have"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        try:
+            remaining = float(remaining)
+        except ValueError:
+            return
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, remaining)
+
 
 class MovieETL:
     """ETL Pipeline for Movie Data"""
@@ -39,13 +153,35 @@ class MovieETL:
         self.config = config
         self.conn = None
         self.cursor = None
+        self.cache_conn = None
+        self._cache_lock = threading.Lock()
+        self.limiter = TokenBucket(config['API_RATE_PER_MIN'], config['API_BURST'])
+        
+        # Keep-alive session so the sync path doesn't reconnect per request
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(
+            pool_connections=1, pool_maxsize=32,
+            max_retries=Retry(total=5, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        ))
         
     def setup_database(self):
         """Create database connection and schema"""
         logger.info(f"Setting up database: {self.config['DB_NAME']}")
-        self.conn = sqlite3.connect(self.config['DB_NAME'])
+        # Autocommit mode: the loaders open their own transactions with BEGIN
+        self.conn = sqlite3.connect(self.config['DB_NAME'], isolation_level=None)
         self.cursor = self.conn.cursor()
         
+        # Bulk-load tuning: fewer fsyncs, large page cache, memory-mapped I/O
+        self.cursor.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+            PRAGMA mmap_size=30000000000;
+            PRAGMA locking_mode=EXCLUSIVE;
+        """)
+        
         # Execute schema from file or inline
         schema_file = Path('schema.sql')
         if schema_file.exists():
@@ -57,6 +193,23 @@ class MovieETL:
         self.conn.commit()
         logger.info("Database schema created successfully")
     
+    def setup_cache(self):
+        """Open the persistent OMDb response cache"""
+        if not self.config.get('CACHE_DB'):
+            return
+        
+        logger.info(f"Using OMDb cache: {self.config['CACHE_DB']}")
+        # Shared by the enrichment worker threads, guarded by _cache_lock
+        self.cache_conn = sqlite3.connect(self.config['CACHE_DB'], check_same_thread=False)
+        self.cache_conn.execute("""
+            CREATE TABLE IF NOT EXISTS omdb_cache (
+                key TEXT PRIMARY KEY,
+                json TEXT NOT NULL,
+                fetched_at INTEGER NOT NULL
+            )
+        """)
+        self.cache_conn.commit()
+    
     def _create_schema_inline(self):
         """Create schema if schema.sql not found"""
         schema = """
@@ -101,6 +254,27 @@ class MovieETL:
         """
         self.cursor.executescript(schema)
     
+    def create_indexes(self):
+        """Build secondary indexes once the bulk load is done"""
+        logger.info("Creating indexes...")
+        
+        # Execute index script from file or inline
+        index_file = Path('indexes.sql')
+        if index_file.exists():
+            with open(index_file, 'r') as f:
+                self.cursor.executescript(f.read())
+        else:
+            self.cursor.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_ratings_movieId ON ratings(movieId);
+            CREATE INDEX IF NOT EXISTS idx_ratings_userId ON ratings(userId);
+            CREATE INDEX IF NOT EXISTS idx_movie_genres_movieId ON movie_genres(movieId);
+            CREATE INDEX IF NOT EXISTS idx_movie_genres_genreId ON movie_genres(genreId);
+            CREATE INDEX IF NOT EXISTS idx_movies_year ON movies(year);
+            ANALYZE;
+            """)
+        
+        logger.info("Indexes created successfully")
+    
     def extract_csv_data(self) -> tuple:
         """Extract data from CSV files"""
         logger.info("Extracting data from CSV files...")
@@ -109,166 +283,364 @@ class MovieETL:
         ratings_path = Path(self.config['DATA_PATH']) / self.config['RATINGS_CSV']
         
         movies_df = pd.read_csv(movies_path)
-        ratings_df = pd.read_csv(ratings_path)
-        
-        logger.info(f"Loaded {len(movies_df)} movies and {len(ratings_df)} ratings")
-        return movies_df, ratings_df
+        # Ratings are streamed in chunks and filtered in SQLite, see load_ratings
+        ratings_chunks = pd.read_csv(
+            ratings_path, engine='c', dtype=RATINGS_DTYPES,
+            usecols=list(RATINGS_DTYPES), chunksize=self.config['RATINGS_CHUNKSIZE']
+        )
+        
+        logger.info(f"Loaded {len(movies_df)} movies, streaming ratings from {ratings_path}")
+        return movies_df, ratings_chunks
     
     def extract_year(self, title: str) -> Optional[int]:
         """Extract year from movie title"""
-        match = re.search(r'\((\d{4})\)', title)
+        match = _YEAR_RE.search(title)
         return int(match.group(1)) if match else None
     
     def clean_title(self, title: str) -> str:
         """Remove year from movie title"""
-        return re.sub(r'\s*\(\d{4}\)\s*$', '', title).strip()
+        return _YEAR_STRIP_RE.sub('', title).strip()
+    
+    def _cache_key(self, title: str, year: Optional[int]) -> str:
+        """Build the cache key for an OMDb lookup"""
+        year = int(year) if pd.notna(year) else ''
+        return hashlib.sha256(f"{title}|{year}".encode()).hexdigest()
+    
+    def _cache_get(self, title: str, year: Optional[int]) -> Optional[Dict]:
+        """Return the cached raw OMDb response, or None on a miss"""
+        if self.cache_conn is None:
+            return None
+        
+        with self._cache_lock:
+            row = self.cache_conn.execute(
+                SELECT_CACHE_SQL, (self._cache_key(title, year),)
+            ).fetchone()
+        if row:
+            return json.loads(row[0])
+        
+        if self.config.get('OMDB_REPLAY'):
+            raise CacheMissError(f"No cached OMDb response for '{title}' ({year})")
+        return None
+    
+    def _is_definitive(self, data: Dict) -> bool:
+        """True for real answers; errors like "Request limit reached!" must be retried"""
+        return data.get('Response') == 'True' or data.get('Error') == 'Movie not found!'
+    
+    def _cache_put(self, title: str, year: Optional[int], data: Dict):
+        """Store a raw OMDb response, skipping transient API errors"""
+        if self.cache_conn is None:
+            return
+        if not self._is_definitive(data):
+            return
+        
+        with self._cache_lock:
+            self.cache_conn.execute(
+                INSERT_CACHE_SQL,
+                (self._cache_key(title, year), json.dumps(data), int(time.time()))
+            )
+            self.cache_conn.commit()
+    
+    def _parse_omdb_response(self, data: Dict, title: str) -> Optional[Dict]:
+        """Pick the fields we keep from a raw OMDb response"""
+        if data.get('Response') == 'True':
+            return {
+                'director': data.get('Director', 'N/A'),
+                'plot': data.get('Plot', 'N/A'),
+                'boxoffice': data.get('BoxOffice', 'N/A'),
+                'runtime': data.get('Runtime', 'N/A'),
+                'rated': data.get('Rated', 'N/A'),
+                'imdbId': data.get('imdbID', 'N/A')
+            }
+        logger.warning(f"Movie not found in OMDb: {title}")
+        return None
+    
+    def _omdb_params(self, title: str, year: Optional[int]) -> Dict:
+        """Query parameters for an OMDb title lookup"""
+        params = {'apikey': self.config['API_KEY'], 't': title}
+        if pd.notna(year):
+            params['y'] = int(year)
+        return params
     
     def fetch_omdb_data(self, title: str, year: Optional[int]) -> Optional[Dict]:
         """Fetch additional movie data from OMDb API"""
+        cached = self._cache_get(title, year)
+        if cached is not None:
+            return self._parse_omdb_response(cached, title)
+        
         try:
-            url = f"http://www.omdbapi.com/?apikey={self.config['API_KEY']}&t={title}"
-            if year:
-                url += f"&y={year}"
-            
-            response = requests.get(url, timeout=10)
+            self.limiter.acquire()
+            response = self.session.get(OMDB_URL, params=self._omdb_params(title, year),
+                                        timeout=10)
+            self.limiter.update_from_headers(response.headers)
             data = response.json()
+            if not self._is_definitive(data):
+                raise RuntimeError(f"OMDb error: {data.get('Error', 'unknown')}")
             
-            if data.get('Response') == 'True':
-                return {
-                    'director': data.get('Director', 'N/A'),
-                    'plot': data.get('Plot', 'N/A'),
-                    'boxoffice': data.get('BoxOffice', 'N/A'),
-                    'runtime': data.get('Runtime', 'N/A'),
-                    'rated': data.get('Rated', 'N/A'),
-                    'imdbId': data.get('imdbID', 'N/A')
-                }
-            else:
-                logger.warning(f"Movie not found in OMDb: {title}")
-                return None
+            self._cache_put(title, year, data)
+            return self._parse_omdb_response(data, title)
                 
         except Exception as e:
             logger.error(f"Error fetching OMDb data for '{title}': {str(e)}")
             return None
     
-    def transform_and_enrich(self, movies_df: pd.DataFrame) -> pd.DataFrame:
-        """Transform and enrich movie data"""
+    async def fetch_omdb_data_async(self, session: aiohttp.ClientSession,
+                                    sem: asyncio.Semaphore, title: str,
+                                    year: Optional[int]) -> Optional[Dict]:
+        """Fetch additional movie data from OMDb API without blocking the event loop"""
+        cached = self._cache_get(title, year)
+        if cached is not None:
+            return self._parse_omdb_response(cached, title)
+        
+        async with sem:
+            try:
+                await self.limiter.acquire_async()
+                params = self._omdb_params(title, year)
+                async with session.get(OMDB_URL, params=params,
+                                       timeout=aiohttp.ClientTimeout(total=10)) as response:
+                    self.limiter.update_from_headers(response.headers)
+                    data = await response.json(content_type=None)
+                self._cache_put(title, year, data)
+                return self._parse_omdb_response(data, title)
+            
+            except Exception as e:
+                logger.error(f"Error fetching OMDb data for '{title}': {str(e)}")
+                return None
+    
+    def _rows_by_lookup_key(self, movies_df: pd.DataFrame) -> Dict:
+        """Group row positions by (title, year) so each distinct lookup runs once"""
+        rows_by_key = {}
+        for i, (title, year) in enumerate(zip(movies_df['clean_title'], movies_df['year'])):
+            key = (title, int(year) if pd.notna(year) else None)
+            rows_by_key.setdefault(key, []).append(i)
+        return rows_by_key
+    
+    async def _enrich_async(self, movies_df: pd.DataFrame, on_result: Callable):
+        """Fetch OMDb data for all movies concurrently, reporting each row as it completes"""
+        sem = asyncio.Semaphore(self.config['MAX_CONCURRENCY'])
+        connector = aiohttp.TCPConnector(limit_per_host=64)
+        
+        rows_by_key = self._rows_by_lookup_key(movies_df)
+        total = len(rows_by_key)
+        
+        async def fetch(key):
+            try:
+                return key, await self.fetch_omdb_data_async(session, sem, *key)
+            except CacheMissError:
+                raise
+            except Exception:
+                return key, None
+        
+        async with aiohttp.ClientSession(connector=connector) as session:
+            tasks = [asyncio.create_task(fetch(key)) for key in rows_by_key]
+            try:
+                for done, next_result in enumerate(asyncio.as_completed(tasks), start=1):
+                    key, api_data = await next_result
+                    for i in rows_by_key[key]:
+                        on_result(i, api_data)
+                    
+                    # Progress logging
+                    if done % 10 == 0:
+                        logger.info(f"Processed {done}/{total} movies...")
+            except BaseException:
+                # Don't leave the remaining lookups running or their errors unretrieved
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+    
+    def _enrich_threaded(self, movies_df: pd.DataFrame, on_result: Callable):
+        """Fetch OMDb data for all movies on a thread pool, reporting each row as it completes"""
+        # One request per distinct (title, year); duplicates share the result
+        rows_by_key = self._rows_by_lookup_key(movies_df)
+        total = len(rows_by_key)
+        
+        with ThreadPoolExecutor(max_workers=self.config['MAX_CONCURRENCY']) as pool:
+            futures = {
+                pool.submit(self.fetch_omdb_data, *key): key
+                for key in rows_by_key
+            }
+            try:
+                for done, fut in enumerate(as_completed(futures), start=1):
+                    api_data = fut.result()
+                    for i in rows_by_key[futures[fut]]:
+                        on_result(i, api_data)
+                    
+                    # Progress logging
+                    if done % 10 == 0:
+                        logger.info(f"Processed {done}/{total} movies...")
+            except BaseException:
+                # Don't let queued lookups keep spending API quota after an abort
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+    
+    def transform_and_enrich(self, movies_df: pd.DataFrame, sink: Callable) -> pd.DataFrame:
+        """Transform and enrich movie data, passing rows to sink in MOVIE_COLUMNS batches
+        
+        Returns the transformed movies frame (with year and clean_title, after the
+        MAX_MOVIES limit); the enriched OMDb columns only go to sink.
+        """
         logger.info("Transforming and enriching movie data...")
         
-        # Extract year and clean title
-        movies_df['year'] = movies_df['title'].apply(self.extract_year)
-        movies_df['clean_title'] = movies_df['title'].apply(self.clean_title)
+        # Extract year and clean title (vectorized; same patterns as extract_year/clean_title)
+        movies_df['year'] = pd.to_numeric(
+            movies_df['title'].str.extract(_YEAR_RE, expand=False)
+        )
+        movies_df['clean_title'] = (
+            movies_df['title'].str.replace(_YEAR_STRIP_RE, '', regex=True).str.strip()
+        )
         
         # Limit movies if configured
         if self.config['MAX_MOVIES']:
             movies_df = movies_df.head(self.config['MAX_MOVIES'])
             logger.info(f"Processing {len(movies_df)} movies (limited)")
         
-        enriched_data = []
         total = len(movies_df)
-        
-        for idx, row in movies_df.iterrows():
-            movie_data = {
-                'movieId': row['movieId'],
-                'title': row['title'],
-                'year': row['year'],
-                'genres': row['genres'],
-                'director': 'N/A',
-                'plot': 'N/A',
-                'boxoffice': 'N/A',
-                'runtime': 'N/A',
-                'rated': 'N/A',
-                'imdbId': 'N/A'
-            }
-            
-            # Fetch from API
-            api_data = self.fetch_omdb_data(row['clean_title'], row['year'])
-            if api_data:
-                movie_data.update(api_data)
-            
-            enriched_data.append(movie_data)
-            
-            # Progress logging
-            if (idx + 1) % 10 == 0:
-                logger.info(f"Processed {idx + 1}/{total} movies...")
-            
-            # Rate limiting
-            time.sleep(self.config['API_DELAY'])
-        
-        enriched_df = pd.DataFrame(enriched_data)
-        logger.info(f"Successfully enriched {len(enriched_df)} movies")
-        return enriched_df
-    
-    def load_movies(self, movies_df: pd.DataFrame):
-        """Load movies into database"""
-        logger.info("Loading movies into database...")
-        
-        for _, row in movies_df.iterrows():
-            self.cursor.execute("""
-                INSERT OR REPLACE INTO movies 
-                (movieId, title, year, imdbId, director, plot, boxoffice, runtime, rated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                row['movieId'], row['title'], row['year'], row['imdbId'],
-                row['director'], row['plot'], row['boxoffice'], 
-                row['runtime'], row['rated']
+        movie_ids = movies_df['movieId'].tolist()
+        titles = movies_df['title'].tolist()
+        years = movies_df['year'].tolist()
+        
+        # Write rows out as responses arrive instead of collecting them all first;
+        # the batch list is reused, so sink must consume it before returning
+        batch = []
+        batch_size = self.config['MOVIE_BATCH_SIZE']
+        written = 0
+        
+        def flush():
+            nonlocal written
+            sink(batch)
+            written += len(batch)
+            batch.clear()
+        
+        def on_result(i: int, api_data: Optional[Dict]):
+            api_data = api_data or {}
+            batch.append((
+                movie_ids[i], titles[i], years[i],
+                api_data.get('imdbId', 'N/A'),
+                api_data.get('director', 'N/A'),
+                api_data.get('plot', 'N/A'),
+                api_data.get('boxoffice', 'N/A'),
+                api_data.get('runtime', 'N/A'),
+                api_data.get('rated', 'N/A')
             ))
+            if len(batch) >= batch_size:
+                flush()
+        
+        logger.info(f"Fetching OMDb data for {total} movies "
+                   f"({self.config['MAX_CONCURRENCY']} concurrent requests, "
+                   f"{self.config['ENRICH_MODE']})...")
+        if self.config['ENRICH_MODE'] == 'threads':
+            self._enrich_threaded(movies_df, on_result)
+        else:
+            asyncio.run(self._enrich_async(movies_df, on_result))
+        
+        if batch:
+            flush()
+        
+        logger.info(f"Successfully enriched {written} movies")
+        return movies_df
+    
+    def load_movies(self, rows: list):
+        """Load a batch of enriched movie rows into database"""
+        self.cursor.execute("BEGIN")
+        self.cursor.executemany(INSERT_MOVIE_SQL, rows)
         
         self.conn.commit()
-        logger.info(f"Loaded {len(movies_df)} movies")
+        logger.debug(f"Loaded {len(rows)} movies")
     
     def load_genres(self, movies_df: pd.DataFrame):
         """Load genres and movie-genre relationships"""
         logger.info("Loading genres...")
         
-        # Extract all unique genres
-        all_genres = set()
-        for genres_str in movies_df['genres']:
-            if pd.notna(genres_str) and genres_str != '(no genres listed)':
-                genres = genres_str.split('|')
-                all_genres.update(genres)
+        # Explode genres into (movieId, genreName) pairs in one pass
+        pairs = (
+            movies_df[['movieId']]
+            .assign(genreName=movies_df['genres'].str.split('|'))
+            .explode('genreName')
+            .dropna()
+        )
+        pairs = pairs[pairs['genreName'] != '(no genres listed)']
+        all_genres = pairs['genreName'].unique()
         
         # Insert genres
-        for genre in all_genres:
-            self.cursor.execute(
-                "INSERT OR IGNORE INTO genres (genreName) VALUES (?)", 
-                (genre,)
-            )
-        
-        self.conn.commit()
+        self.cursor.execute("BEGIN")
+        self.cursor.executemany(INSERT_GENRE_SQL, [(genre,) for genre in all_genres])
         
         # Create genre mapping
-        self.cursor.execute("SELECT genreId, genreName FROM genres")
-        genre_map = {name: id for id, name in self.cursor.fetchall()}
+        genre_map_df = pd.read_sql_query("SELECT genreId, genreName FROM genres", self.conn)
+        links = pairs.merge(genre_map_df, on='genreName')[['movieId', 'genreId']]
         
         # Insert movie-genre relationships
-        for _, row in movies_df.iterrows():
-            if pd.notna(row['genres']) and row['genres'] != '(no genres listed)':
-                genres = row['genres'].split('|')
-                for genre in genres:
-                    if genre in genre_map:
-                        self.cursor.execute("""
-                            INSERT OR IGNORE INTO movie_genres (movieId, genreId)
-                            VALUES (?, ?)
-                        """, (row['movieId'], genre_map[genre]))
+        self.cursor.executemany(INSERT_MOVIE_GENRE_SQL, links.itertuples(index=False, name=None))
         
         self.conn.commit()
         logger.info(f"Loaded {len(all_genres)} genres")
     
-    def load_ratings(self, ratings_df: pd.DataFrame, processed_movie_ids: set):
-        """Load ratings for processed movies"""
+    def load_ratings(self, ratings_chunks):
+        """Load ratings for movies already in the movies table"""
         logger.info("Loading ratings...")
         
-        # Filter ratings for processed movies only
-        ratings_subset = ratings_df[ratings_df['movieId'].isin(processed_movie_ids)]
-        
-        for _, row in ratings_subset.iterrows():
-            self.cursor.execute("""
-                INSERT INTO ratings (movieId, userId, rating, timestamp)
-                VALUES (?, ?, ?, ?)
-            """, (row['movieId'], row['userId'], row['rating'], row['timestamp']))
+        # Filter each chunk before it touches the database, so non-matching ratings
+        # never leave dead pages behind; memory stays bounded by RATINGS_CHUNKSIZE
+        self.cursor.execute("SELECT movieId FROM movies")
+        movie_ids = {movie_id for (movie_id,) in self.cursor.fetchall()}
+        
+        # Multi-row INSERTs are sized to stay under the bound-parameter limit
+        columns = ['movieId', 'userId', 'rating', 'timestamp']
+        loaded = 0
+        read = 0
+        for chunk in ratings_chunks:
+            subset = chunk.loc[chunk['movieId'].isin(movie_ids), columns]
+            read += len(chunk)
+            if subset.empty:
+                continue
+            
+            self.cursor.execute("BEGIN")
+            subset.to_sql(
+                'ratings', self.conn, if_exists='append', index=False,
+                method='multi', chunksize=SQLITE_MAX_VARIABLES // len(columns)
+            )
+            self.conn.commit()
+            loaded += len(subset)
         
-        self.conn.commit()
-        logger.info(f"Loaded {len(ratings_subset)} ratings")
+        logger.info(f"Loaded {loaded} ratings (of {read} in file)")
+    
+    def write_parquet(self, movies_df: pd.DataFrame, movie_rows: list, ratings_chunks):
+        """Write enriched movies and their ratings as Parquet instead of SQLite"""
+        logger.info("Writing Parquet extracts...")
+        
+        out_dir = Path(self.config['PARQUET_DIR'])
+        out_dir.mkdir(parents=True, exist_ok=True)
+        
+        enriched_df = pd.DataFrame(movie_rows, columns=list(MOVIE_COLUMNS)).merge(
+            movies_df[['movieId', 'genres']], on='movieId'
+        )
+        # Match the INTEGER year SQLite stores rather than the float64 used while transforming
+        enriched_df['year'] = enriched_df['year'].astype('Int64')
+        enriched_df.to_parquet(out_dir / 'movies.parquet', compression='zstd', index=False)
+        
+        # Partitioned writes add files next to existing ones, so clear the dataset once
+        # and then append each filtered chunk; memory stays bounded by RATINGS_CHUNKSIZE
+        ratings_dir = out_dir / 'ratings.parquet'
+        shutil.rmtree(ratings_dir, ignore_errors=True)
+        
+        movie_ids = set(enriched_df['movieId'])
+        written = 0
+        for chunk in ratings_chunks:
+            subset = chunk[chunk['movieId'].isin(movie_ids)]
+            if subset.empty:
+                continue
+            subset.to_parquet(ratings_dir, partition_cols=['movieId'],
+                              compression='zstd', index=False)
+            written += len(subset)
+        
+        if not written:
+            # A partitioned write of no rows creates nothing; keep an empty, typed dataset
+            logger.warning("No ratings matched the processed movies")
+            ratings_dir.mkdir()
+            empty = pd.DataFrame(columns=list(RATINGS_DTYPES)).astype(RATINGS_DTYPES)
+            empty.to_parquet(ratings_dir / 'part-0.parquet', compression='zstd', index=False)
+        
+        logger.info(f"Wrote {len(enriched_df)} movies and {written} ratings to {out_dir}")
     
     def verify_data(self):
         """Verify data was loaded correctly"""
@@ -294,24 +666,35 @@ class MovieETL:
         try:
             logger.info("Starting ETL Pipeline...")
             
+            parquet = self.config['OUTPUT'] == 'parquet'
+            
             # Setup
-            self.setup_database()
+            if parquet:
+                # Fail now rather than after the whole OMDb enrichment has run
+                import pyarrow  # noqa: F401
+            else:
+                self.setup_database()
+            self.setup_cache()
             
             # Extract
-            movies_df, ratings_df = self.extract_csv_data()
-            
-            # Transform
-            enriched_movies = self.transform_and_enrich(movies_df)
-            
-            # Load
-            self.load_movies(enriched_movies)
-            self.load_genres(enriched_movies)
-            
-            processed_ids = set(enriched_movies['movieId'].values)
-            self.load_ratings(ratings_df, processed_ids)
+            movies_df, ratings_chunks = self.extract_csv_data()
             
-            # Verify
-            self.verify_data()
+            if parquet:
+                # Transform, then write columnar extracts and skip SQLite entirely
+                movie_rows = []
+                movies_df = self.transform_and_enrich(movies_df, sink=movie_rows.extend)
+                self.write_parquet(movies_df, movie_rows, ratings_chunks)
+            else:
+                # Transform, loading movies as they are enriched
+                movies_df = self.transform_and_enrich(movies_df, sink=self.load_movies)
+                
+                # Load
+                self.load_genres(movies_df)
+                self.load_ratings(ratings_chunks)
+                self.create_indexes()
+                
+                # Verify
+                self.verify_data()
             
             logger.info("ETL Pipeline completed successfully!")
             
@@ -323,8 +706,16 @@ class MovieETL:
             if self.conn:
                 self.conn.close()
                 logger.info("Database connection closed")
+            self.session.close()
+            if self.cache_conn:
+                self.cache_conn.close()
 
 
 if __name__ == "__main__":
-    etl = MovieETL(CONFIG)
+    parser = argparse.ArgumentParser(description="Movie Data Pipeline - ETL Script")
+    parser.add_argument('--output', choices=['sqlite', 'parquet'], default=CONFIG['OUTPUT'],
+                        help="load into SQLite (default) or write Parquet extracts")
+    args = parser.parse_args()
+    
+    etl = MovieETL({**CONFIG, 'OUTPUT': args.output})
     etl.run_pipeline()
@@ -0,0 +1,13 @@
+-- Secondary indexes for Movie Data Pipeline
+-- Built once after the bulk load: one sort-based build per index is much
+-- cheaper than maintaining them on every insert
+
+-- Creates indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_ratings_movieId ON ratings(movieId);
+CREATE INDEX IF NOT EXISTS idx_ratings_userId ON ratings(userId);
+CREATE INDEX IF NOT EXISTS idx_movie_genres_movieId ON movie_genres(movieId);
+CREATE INDEX IF NOT EXISTS idx_movie_genres_genreId ON movie_genres(genreId);
+CREATE INDEX IF NOT EXISTS idx_movies_year ON movies(year);
+
+-- Refresh planner statistics for the analytical queries
+ANALYZE;
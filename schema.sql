@@ -43,9 +43,4 @@ CREATE TABLE ratings (
     FOREIGN KEY (movieId) REFERENCES movies(movieId)
 );
 
--- Creates indexes for better query performance
-CREATE INDEX idx_ratings_movieId ON ratings(movieId);
-CREATE INDEX idx_ratings_userId ON ratings(userId);
-CREATE INDEX idx_movie_genres_movieId ON movie_genres(movieId);
-CREATE INDEX idx_movie_genres_genreId ON movie_genres(genreId);
-CREATE INDEX idx_movies_year ON movies(year);
+-- Secondary indexes live in indexes.sql and are built after the bulk load